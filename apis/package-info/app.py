@@ -1,15 +1,208 @@
-from fastapi import FastAPI, HTTPException, APIRouter
-from typing import List, Dict, Optional
-from pydantic import BaseModel
-import requests
+from fastapi import FastAPI, HTTPException, APIRouter, Response
+from fastapi.responses import ORJSONResponse
+from typing import Any, Awaitable, Callable, List, Dict, Mapping, Optional, Tuple
+from pydantic import BaseModel, ConfigDict
+from collections import OrderedDict
+from contextlib import asynccontextmanager, nullcontext
+from functools import lru_cache
+import asyncio
+import httpx
+import orjson
 import re
+import time
 from urllib.parse import urlparse
 
+# Validation patterns for package names
+_PKG_NAME_RE = re.compile(r"\A[a-zA-Z0-9_-]+\Z")
+_NPM_PKG_NAME_RE = re.compile(r"\A[a-zA-Z0-9._-]+\Z")
+
+# Repository hosts and the platform they belong to
+_HOST_PLATFORMS = {
+    "github.com": "github",
+    "gitlab.com": "gitlab",
+    "bitbucket.org": "bitbucket",
+}
+
+# Fields of a PyPI document's info section used for package info
+_PYPI_INFO_FIELDS = ("summary", "version", "project_urls")
+
+# PyPI project URL types, in priority order, that point at the source repository
+_PRIMARY_REPO_TYPES = frozenset({"Source", "Repository", "Code"})
+_SECONDARY_REPO_TYPES = frozenset({"Homepage"})
+# Known non-repository project URL types, never used as a fallback
+_EXCLUDED_URL_TYPES = frozenset({"Funding", "Sponsor", "Donate", "Bug Tracker", "Issue Tracker", "Documentation"})
+
+# Plain https://host/ prefixes, parsed without the regex since nearly all URLs take this form
+_REPO_URL_PREFIXES = (
+    ("https://github.com/", "github"),
+    ("https://gitlab.com/", "gitlab"),
+    ("https://bitbucket.org/", "bitbucket"),
+)
+
+# Repository URL: optional git+ prefix, scheme, optional user info, a known host
+# or one of its subdomains, optional port, then the organization and repository
+_REPO_URL_RE = re.compile(
+    r"\A(?:git\+)?[a-z][a-z0-9+.-]*://"
+    r"(?:[^@/?#]*@)?"
+    r"(?:[^/?#:@]+\.)?(github\.com|gitlab\.com|bitbucket\.org)"
+    r"(?::\d*)?"
+    r"/+([^/?#]+)/([^/?#]+?)(?:\.git)?(?:[/?#]|\Z)",
+    re.IGNORECASE
+)
+
+# Upstream request settings
+REQUEST_TIMEOUT = httpx.Timeout(10, connect=3.05)
+USER_AGENT = "health-package-info (+https://github.com/zchryr/health)"
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+
+# Maximum number of packages of one batch fetched at the same time
+BATCH_CONCURRENCY = 32
+# Longest a batch waits for one package, in seconds, before serving it from the stale cache
+BATCH_ITEM_TIMEOUT = 5
+
+# Per-host concurrency limits and the longest pause honoured for an exhausted rate limit
+HOST_CONCURRENCY = {"pypi.org": 50, "registry.npmjs.org": 50}
+MAX_RATE_LIMIT_WAIT = 30
+
+# Upstream hosts whose connections are opened at startup
+PREWARM_URLS = ["https://pypi.org/", "https://registry.npmjs.org/"]
+
+# Upstream response cache settings
+CACHE_TTL = 300
+NEGATIVE_CACHE_TTL = 60
+# How long past its TTL a cached document may still be served while upstream is failing
+STALE_TTL = 24 * 60 * 60
+CACHE_MAXSIZE = 4096
+# Cache-Control sent with single-package responses; stale fallbacks should always be revalidated
+CACHE_CONTROL = f"public, max-age={CACHE_TTL}"
+STALE_CACHE_CONTROL = "no-cache"
+
+class ResponseCache:
+    """
+    Least-recently-used cache of upstream JSON documents with a time-to-live.
+    Expired entries are kept until evicted so their ETag can be revalidated.
+    """
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Optional[str], Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Tuple[float, Optional[str], Any]]:
+        """
+        Return the (expires_at, etag, value) entry for key, fresh or not.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, value: Any, etag: Optional[str] = None, ttl: Optional[float] = None) -> None:
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), etag, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+response_cache = ResponseCache(CACHE_MAXSIZE, CACHE_TTL)
+
+# Upstream fetches in progress, keyed by URL
+_inflight_fetches: Dict[str, "asyncio.Future[Tuple[Optional[Dict], bool]]"] = {}
+
+class HostThrottle:
+    """
+    Bounds concurrent requests to one upstream host and pauses new requests
+    while the host reports its rate limit as exhausted.
+    """
+    def __init__(self, max_concurrency: int):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._resume_at = 0.0
+
+    async def __aenter__(self) -> "HostThrottle":
+        await self._semaphore.acquire()
+        delay = self._resume_at - time.monotonic()
+        # Waits longer than MAX_RATE_LIMIT_WAIT are not worth holding a request for
+        if 0 < delay <= MAX_RATE_LIMIT_WAIT:
+            await asyncio.sleep(delay)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._semaphore.release()
+
+    def update(self, status: int, headers: Mapping[str, str]) -> None:
+        """
+        Record the rate limit state advertised in an upstream response.
+        """
+        delay = None
+        retry_after = headers.get("Retry-After")
+        remaining = headers.get("X-RateLimit-Remaining") or headers.get("RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset") or headers.get("RateLimit-Reset")
+        if status == 429 and retry_after and retry_after.isdigit():
+            delay = int(retry_after)
+        elif remaining == "0" and reset and reset.isdigit():
+            # Reset is either an epoch timestamp or a number of seconds from now
+            delay = int(reset) - time.time() if int(reset) > 1_000_000_000 else int(reset)
+        if delay is not None:
+            self._resume_at = max(self._resume_at, time.monotonic() + max(delay, 0))
+
+# Per-host throttles, created in the app lifespan
+host_throttles: Dict[str, HostThrottle] = {}
+
+# Shared HTTP client, created in the app lifespan and reused across requests
+http_client: Optional[httpx.AsyncClient] = None
+
+async def prewarm_connections(client: httpx.AsyncClient) -> None:
+    """
+    Resolve and connect to each upstream host so the first requests skip DNS and TLS setup.
+    Failures are ignored; the connection is simply opened on first use instead.
+    """
+    async def prewarm(url: str) -> None:
+        try:
+            await client.head(url)
+        except httpx.HTTPError:
+            pass
+
+    await asyncio.gather(*[prewarm(url) for url in PREWARM_URLS])
+
+def create_http_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """
+    Create the HTTP client used for upstream requests; transport overrides the network transport.
+    """
+    return httpx.AsyncClient(
+        headers={"User-Agent": USER_AGENT},
+        http2=True,
+        # PyPI redirects non-canonical project names to the canonical one
+        follow_redirects=True,
+        timeout=REQUEST_TIMEOUT,
+        limits=httpx.Limits(max_connections=128, max_keepalive_connections=100),
+        transport=transport
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open the shared HTTP client on startup and close it on shutdown.
+    """
+    global http_client
+    host_throttles.update({host: HostThrottle(limit) for host, limit in HOST_CONCURRENCY.items()})
+    http_client = create_http_client()
+    prewarm_task = asyncio.create_task(prewarm_connections(http_client))
+    yield
+    prewarm_task.cancel()
+    await http_client.aclose()
+    http_client = None
+    host_throttles.clear()
+
 # Create the main FastAPI app
 app = FastAPI(
     title="Package Repository Checker",
     description="API to check repository information for Python packages on PyPI and NPM packages on npmjs.org",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Create a router for v1
@@ -20,6 +213,8 @@ pypi_router = APIRouter(prefix="/pypi")
 npm_router = APIRouter(prefix="/npm")
 
 class PackageInfo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     summary: Optional[str] = None
     repository_url: Optional[str] = None
@@ -29,64 +224,185 @@ class PackageInfo(BaseModel):
     latest_version: Optional[str] = None
     created_date: Optional[str] = None
     error: bool = False
+    stale: bool = False
 
 class PackageResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     packages: List[PackageInfo]
 
-def get_library_info(library_name: str) -> Dict:
+async def fetch_json(
+    client: httpx.AsyncClient,
+    url: str,
+    trim: Optional[Callable[[Dict], Dict]] = None,
+    timeout: Optional[float] = None
+) -> Tuple[Optional[Dict], bool]:
+    """
+    Fetch a JSON document, retrying transient upstream failures with exponential backoff.
+    Documents are cached for CACHE_TTL seconds and revalidated with their ETag afterwards;
+    missing documents are cached for NEGATIVE_CACHE_TTL seconds. Concurrent misses for the
+    same URL share a single upstream request.
+    If upstream fails, or does not answer within timeout seconds, a cached document up to
+    STALE_TTL seconds past its TTL is served instead.
+    If given, trim reduces the document to the parts callers use before it is cached.
+    Returns the document, or None if it is missing or could not be fetched, and whether
+    it is a stale cached copy.
+    """
+    cached = response_cache.get(url)
+    if cached and cached[0] > time.monotonic():
+        return cached[2], False
+
+    inflight = _inflight_fetches.get(url)
+    if inflight is None:
+        inflight = asyncio.ensure_future(_refresh_json(client, url, trim, cached))
+        _inflight_fetches[url] = inflight
+        inflight.add_done_callback(lambda _: _inflight_fetches.pop(url, None))
+    try:
+        # Shield the shared fetch so one cancelled or timed out caller does not cancel it for
+        # the others; it keeps running and still fills the cache
+        return await asyncio.wait_for(asyncio.shield(inflight), timeout)
+    except asyncio.TimeoutError:
+        return _stale_fallback(cached)
+
+async def _refresh_json(
+    client: httpx.AsyncClient,
+    url: str,
+    trim: Optional[Callable[[Dict], Dict]],
+    cached: Optional[Tuple[float, Optional[str], Any]]
+) -> Tuple[Optional[Dict], bool]:
+    """
+    Fetch a JSON document from upstream and store the outcome in the response cache.
+    Falls back to the expired cached document, if recent enough, when upstream fails.
+    """
+    headers = {"If-None-Match": cached[1]} if cached and cached[1] else None
+    throttle = host_throttles.get(urlparse(url).hostname)
+
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with throttle or nullcontext():
+                response = await client.get(url, headers=headers)
+        except httpx.RequestError:
+            response = None
+
+        if response is not None:
+            if throttle:
+                throttle.update(response.status_code, response.headers)
+            if response.status_code == 304 and cached:
+                response_cache.set(url, cached[2], cached[1])
+                return cached[2], False
+            if response.status_code not in RETRY_STATUSES:
+                if response.status_code in (404, 410):
+                    response_cache.set(url, None, ttl=NEGATIVE_CACHE_TTL)
+                    return None, False
+                if not response.is_success:
+                    return _stale_fallback(cached)
+                try:
+                    data = orjson.loads(response.content)
+                except orjson.JSONDecodeError:
+                    return _stale_fallback(cached)
+                if trim:
+                    data = trim(data)
+                response_cache.set(url, data, response.headers.get("ETag"))
+                return data, False
+
+        if attempt < MAX_RETRIES:
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+    return _stale_fallback(cached)
+
+def _stale_fallback(cached: Optional[Tuple[float, Optional[str], Any]]) -> Tuple[Optional[Dict], bool]:
+    """
+    Return the expired cached document if it is within STALE_TTL of its expiry.
+    """
+    if cached and cached[2] is not None and cached[0] + STALE_TTL > time.monotonic():
+        return cached[2], True
+    return None, False
+
+def trim_pypi_document(data: Dict) -> Dict:
+    """
+    Keep only the parts of a PyPI project document used for package info.
+    The long description and the release history, usually the bulk of the payload, are dropped;
+    of the release files only the upload time of the first file of the latest version is kept.
+    """
+    info = data.get("info") or {}
+    latest_version = info.get("version")
+    trimmed = {"info": {field: info[field] for field in _PYPI_INFO_FIELDS if field in info}}
+
+    urls = data.get("urls") or []
+    trimmed["urls"] = [{"upload_time_iso_8601": urls[0].get("upload_time_iso_8601")}] if urls else []
+    releases = (data.get("releases") or {}).get(latest_version) if latest_version else None
+    if releases is not None:
+        trimmed["releases"] = {
+            latest_version: [{"upload_time_iso_8601": releases[0].get("upload_time_iso_8601")}] if releases else []
+        }
+    return trimmed
+
+def trim_npm_document(data: Dict) -> Dict:
+    """
+    Keep only the parts of an NPM packument used for package info.
+    The per-version manifests, usually the bulk of the payload, are dropped.
+    """
+    dist_tags = data.get("dist-tags") or {}
+    latest_version = dist_tags.get("latest")
+    time_info = data.get("time") or {}
+    trimmed = {
+        "name": data.get("name"),
+        "description": data.get("description"),
+        "dist-tags": dist_tags,
+        "time": {latest_version: time_info[latest_version]} if latest_version in time_info else {}
+    }
+    if "repository" in data:
+        trimmed["repository"] = data["repository"]
+    return trimmed
+
+async def get_library_info(
+    client: httpx.AsyncClient,
+    library_name: str,
+    timeout: Optional[float] = None
+) -> Tuple[Optional[Dict], bool]:
     """
     Get information about a Python library from PyPI.
     """
     # Validate library_name to prevent partial SSRF
-    if not re.match(r"^[a-zA-Z0-9_-]+$", library_name):
+    if not _PKG_NAME_RE.match(library_name):
         raise ValueError("Invalid library name. Only alphanumeric characters, dashes, and underscores are allowed.")
 
     url = f"https://pypi.org/pypi/{library_name}/json"
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        return None
+    return await fetch_json(client, url, trim_pypi_document, timeout)
 
-def get_npm_info(package_name: str) -> Dict:
+async def get_npm_info(
+    client: httpx.AsyncClient,
+    package_name: str,
+    timeout: Optional[float] = None
+) -> Tuple[Optional[Dict], bool]:
     """
     Get information about an NPM package from npmjs.org.
     """
     # Validate package_name to prevent partial SSRF
-    if not re.match(r"^[a-zA-Z0-9_-]+$", package_name):
+    if not _PKG_NAME_RE.match(package_name):
         raise ValueError("Invalid package name. Only alphanumeric characters, dashes, and underscores are allowed.")
 
     url = f"https://registry.npmjs.org/{package_name}"
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        return None
+    return await fetch_json(client, url, trim_npm_document, timeout)
 
+@lru_cache(maxsize=4096)
 def parse_repo_url(url: str) -> tuple[Optional[str], Optional[str], Optional[str]]:
     """
     Parse a repository URL to extract platform, organization, and repository name.
     """
-    # Handle git+https:// URLs
-    if url.startswith('git+'):
-        url = url[4:]
-
-    parsed_url = urlparse(url)
-    path_parts = parsed_url.path.strip('/').split('/')
-
-    if len(path_parts) >= 2:
-        org = path_parts[0]
-        repo = path_parts[1]
-        repo = repo.replace('.git', '')
-
-        if parsed_url.netloc.endswith('.github.com') or parsed_url.netloc == 'github.com':
-            return 'github', org, repo
-        elif parsed_url.netloc.endswith('.gitlab.com') or parsed_url.netloc == 'gitlab.com':
-            return 'gitlab', org, repo
-        elif parsed_url.netloc.endswith('.bitbucket.org') or parsed_url.netloc == 'bitbucket.org':
-            return 'bitbucket', org, repo
+    # Fast path for plain https URLs; anything unusual falls through to the regex
+    if "?" not in url and "#" not in url:
+        for prefix, platform in _REPO_URL_PREFIXES:
+            if url.startswith(prefix):
+                org, _, tail = url[len(prefix):].partition("/")
+                repo = tail.partition("/")[0].removesuffix(".git")
+                if org and repo:
+                    return platform, org, repo
+                break
+
+    match = _REPO_URL_RE.match(url)
+    if match:
+        host, org, repo = match.groups()
+        return _HOST_PLATFORMS[host.lower()], org, repo
 
     return None, None, None
 
@@ -98,34 +414,30 @@ def extract_repo_info(info: Dict) -> tuple[Optional[str], Optional[str], Optiona
     if not info or "project_urls" not in info:
         return None, None, None, None
 
-    # Priority order for repository URL types
-    primary_repo_types = ["Source", "Repository", "Code"]
-    secondary_repo_types = ["Homepage"]
-
-    # First try primary repository URL types
-    for url_type, url in info["project_urls"].items():
-        if url_type in primary_repo_types:
-            platform, org, repo = parse_repo_url(url)
-            if platform:
-                return url, platform, org, repo
-
-    # Then try secondary repository URL types
+    # Single pass: keep the best match so far and stop at the first primary match.
+    # Any other GitHub/GitLab/Bitbucket URL is the lowest-priority fallback.
+    best = None
+    best_priority = None
     for url_type, url in info["project_urls"].items():
-        if url_type in secondary_repo_types:
-            platform, org, repo = parse_repo_url(url)
-            if platform:
-                return url, platform, org, repo
+        if url_type in _PRIMARY_REPO_TYPES:
+            priority = 0
+        elif url_type in _SECONDARY_REPO_TYPES:
+            priority = 1
+        elif url_type in _EXCLUDED_URL_TYPES:
+            continue
+        else:
+            priority = 2
 
-    # If no specific repository URL found, look for any GitHub/GitLab/Bitbucket URL
-    # but exclude known non-repository types
-    excluded_types = ["Funding", "Sponsor", "Donate", "Bug Tracker", "Issue Tracker", "Documentation"]
-    for url_type, url in info["project_urls"].items():
-        if url_type not in excluded_types:
-            platform, org, repo = parse_repo_url(url)
-            if platform:
+        if best_priority is not None and priority >= best_priority:
+            continue
+        platform, org, repo = parse_repo_url(url)
+        if platform:
+            if priority == 0:
                 return url, platform, org, repo
+            best = (url, platform, org, repo)
+            best_priority = priority
 
-    return None, None, None, None
+    return best or (None, None, None, None)
 
 def extract_npm_repo_info(info: Dict) -> tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
     """
@@ -144,8 +456,17 @@ def extract_npm_repo_info(info: Dict) -> tuple[Optional[str], Optional[str], Opt
 def get_latest_version_release_date(info: Dict) -> Optional[str]:
     """
     Get the release date of the latest version from PyPI package info.
+    Prefers the files listed under "urls", which describe the latest version,
+    and falls back to the full release history.
     """
-    if not info or "releases" not in info:
+    if not info:
+        return None
+
+    urls = info.get("urls")
+    if urls:
+        return urls[0].get("upload_time_iso_8601")
+
+    if "releases" not in info:
         return None
 
     latest_version = info.get("info", {}).get("version")
@@ -159,53 +480,40 @@ def get_latest_version_release_date(info: Dict) -> Optional[str]:
 
     return releases[0].get("upload_time_iso_8601")
 
-@pypi_router.get("/{package_name}", response_model=PackageInfo)
-async def get_package_info(package_name: str):
+def build_pypi_package_info(package_name: str, info: Optional[Dict], stale: bool = False) -> PackageInfo:
     """
-    Get repository information for a single PyPI package.
+    Build the package info for a PyPI package from its (possibly missing) PyPI document.
     """
-    info = get_library_info(package_name)
-
     if not info:
-        raise HTTPException(status_code=404, detail=f"Package {package_name} not found on PyPI")
+        return PackageInfo.model_construct(name=package_name, error=True)
 
     package_info = info.get("info", {})
     repo_url, platform, org, repo = extract_repo_info(package_info)
-    latest_version = package_info.get("version")
-    created_date = get_latest_version_release_date(info)
 
-    return PackageInfo(
+    return PackageInfo.model_construct(
         name=package_name,
         summary=package_info.get("summary"),
         repository_url=repo_url,
         repository_platform=platform,
         repository_org=org,
         repository_name=repo,
-        latest_version=latest_version,
-        created_date=created_date,
-        error=False
+        latest_version=package_info.get("version"),
+        created_date=get_latest_version_release_date(info),
+        error=False,
+        stale=stale
     )
 
-@npm_router.get("/{package_name}", response_model=PackageInfo)
-async def get_npm_package_info(package_name: str):
+def build_npm_package_info(package_name: str, info: Optional[Dict], stale: bool = False) -> PackageInfo:
     """
-    Get repository information for a single NPM package.
+    Build the package info for an NPM package from its (possibly missing) packument.
     """
-    # Validate package_name to ensure it matches the expected format for NPM package names
-    import re
-    if not re.fullmatch(r"[a-zA-Z0-9._-]+", package_name):
-        raise HTTPException(status_code=400, detail="Invalid package name format")
-
-    info = get_npm_info(package_name)
-
     if not info:
-        raise HTTPException(status_code=404, detail=f"Package {package_name} not found on npmjs.org")
+        return PackageInfo.model_construct(name=package_name, error=True)
 
     repo_url, platform, org, repo = extract_npm_repo_info(info)
     latest_version = info.get("dist-tags", {}).get("latest")
-    created_date = info.get("time", {}).get(latest_version) if latest_version else None
 
-    return PackageInfo(
+    return PackageInfo.model_construct(
         name=package_name,
         summary=info.get("description"),
         repository_url=repo_url,
@@ -213,80 +521,83 @@ async def get_npm_package_info(package_name: str):
         repository_org=org,
         repository_name=repo,
         latest_version=latest_version,
-        created_date=created_date,
-        error=False
+        created_date=info.get("time", {}).get(latest_version) if latest_version else None,
+        error=False,
+        stale=stale
     )
 
-@pypi_router.post("/batch", response_model=PackageResponse)
-async def get_multiple_packages(package_names: List[str]):
+async def get_batch_package_info(
+    package_names: List[str],
+    fetch: Callable[[httpx.AsyncClient, str, Optional[float]], Awaitable[Tuple[Optional[Dict], bool]]],
+    build: Callable[[str, Optional[Dict], bool], PackageInfo]
+) -> ORJSONResponse:
     """
-    Get repository information for multiple PyPI packages.
+    Fetch and build package info for a batch of names concurrently.
+    Each distinct name is fetched once, at most BATCH_CONCURRENCY at a time,
+    and a failure for one name is reported as an error entry for that name only.
+    A fetch taking longer than BATCH_ITEM_TIMEOUT seconds is served from the stale cache,
+    or reported as a failure if there is none.
     """
-    results = []
+    unique_names = list(dict.fromkeys(package_names))
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
 
-    for package_name in package_names:
-        info = get_library_info(package_name)
+    async def fetch_one(package_name: str) -> PackageInfo:
+        async with semaphore:
+            info, stale = await fetch(http_client, package_name, BATCH_ITEM_TIMEOUT)
+        return build(package_name, info, stale)
 
-        if not info:
-            results.append(PackageInfo(
-                name=package_name,
-                error=True
-            ))
-            continue
+    raw = await asyncio.gather(*[fetch_one(name) for name in unique_names], return_exceptions=True)
+    result_map = {
+        name: (PackageInfo.model_construct(name=name, error=True) if isinstance(result, BaseException) else result).model_dump()
+        for name, result in zip(unique_names, raw)
+    }
 
-        package_info = info.get("info", {})
-        repo_url, platform, org, repo = extract_repo_info(package_info)
-        latest_version = package_info.get("version")
-        created_date = get_latest_version_release_date(info)
-
-        results.append(PackageInfo(
-            name=package_name,
-            summary=package_info.get("summary"),
-            repository_url=repo_url,
-            repository_platform=platform,
-            repository_org=org,
-            repository_name=repo,
-            latest_version=latest_version,
-            created_date=created_date,
-            error=False
-        ))
-
-    return PackageResponse(packages=results)
+    # Results are built from already-extracted fields, so skip response re-validation
+    return ORJSONResponse({"packages": [result_map[name] for name in package_names]})
 
-@npm_router.post("/batch", response_model=PackageResponse)
-async def get_multiple_npm_packages(package_names: List[str]):
+@pypi_router.get("/{package_name}", response_model=PackageInfo)
+async def get_package_info(package_name: str, response: Response):
     """
-    Get repository information for multiple NPM packages.
+    Get repository information for a single PyPI package.
     """
-    results = []
+    info, stale = await get_library_info(http_client, package_name)
 
-    for package_name in package_names:
-        info = get_npm_info(package_name)
+    if not info:
+        raise HTTPException(status_code=404, detail=f"Package {package_name} not found on PyPI")
 
-        if not info:
-            results.append(PackageInfo(
-                name=package_name,
-                error=True
-            ))
-            continue
+    response.headers["Cache-Control"] = STALE_CACHE_CONTROL if stale else CACHE_CONTROL
+    return build_pypi_package_info(package_name, info, stale)
+
+@npm_router.get("/{package_name}", response_model=PackageInfo)
+async def get_npm_package_info(package_name: str, response: Response):
+    """
+    Get repository information for a single NPM package.
+    """
+    # Validate package_name to ensure it matches the expected format for NPM package names
+    if not _NPM_PKG_NAME_RE.match(package_name):
+        raise HTTPException(status_code=400, detail="Invalid package name format")
+
+    info, stale = await get_npm_info(http_client, package_name)
+
+    if not info:
+        raise HTTPException(status_code=404, detail=f"Package {package_name} not found on npmjs.org")
 
-        repo_url, platform, org, repo = extract_npm_repo_info(info)
-        latest_version = info.get("dist-tags", {}).get("latest")
-        created_date = info.get("time", {}).get(latest_version) if latest_version else None
-
-        results.append(PackageInfo(
-            name=package_name,
-            summary=info.get("description"),
-            repository_url=repo_url,
-            repository_platform=platform,
-            repository_org=org,
-            repository_name=repo,
-            latest_version=latest_version,
-            created_date=created_date,
-            error=False
-        ))
-
-    return PackageResponse(packages=results)
+    response.headers["Cache-Control"] = STALE_CACHE_CONTROL if stale else CACHE_CONTROL
+    return build_npm_package_info(package_name, info, stale)
+
+@pypi_router.post("/batch", response_model=PackageResponse)
+async def get_multiple_packages(package_names: List[str]):
+    """
+    Get repository information for multiple PyPI packages.
+    """
+    return await get_batch_package_info(package_names, get_library_info, build_pypi_package_info)
+
+@npm_router.post("/batch", response_model=PackageResponse)
+async def get_multiple_npm_packages(package_names: List[str]):
+    """
+    Get repository information for multiple NPM packages.
+    """
+    return await get_batch_package_info(package_names, get_npm_info, build_npm_package_info)
 
 # Include the routers
 v1_router.include_router(pypi_router)
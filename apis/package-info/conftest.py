@@ -0,0 +1,13 @@
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app import app
+
+@pytest.fixture(scope="session")
+def client():
+    """
+    Shared test client; the app lifespan runs once per test session.
+    Connection prewarming is disabled so tests never contact the real upstream hosts.
+    """
+    with patch("app.prewarm_connections"), TestClient(app) as c:
+        yield c
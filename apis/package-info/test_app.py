@@ -1,9 +1,21 @@
 import pytest
-from fastapi.testclient import TestClient
+import asyncio
+import httpx
+from types import MappingProxyType
 from unittest.mock import patch, MagicMock
-from app import app, parse_repo_url, extract_repo_info, extract_npm_repo_info
-
-client = TestClient(app)
+from app import (
+    parse_repo_url,
+    extract_repo_info,
+    extract_npm_repo_info,
+    get_latest_version_release_date,
+    fetch_json,
+    create_http_client,
+    get_library_info,
+    trim_pypi_document,
+    trim_npm_document,
+    response_cache,
+    HostThrottle
+)
 
 # Test utility functions
 def test_parse_repo_url():
@@ -25,6 +37,27 @@ def test_parse_repo_url():
     assert org == "org"
     assert repo == "repo"
 
+    # Test uppercase host, port and user info
+    platform, org, repo = parse_repo_url("git+ssh://git@GitHub.com:22/org/repo.git")
+    assert platform == "github"
+    assert org == "org"
+    assert repo == "repo"
+
+    # Test subdomain
+    platform, org, repo = parse_repo_url("https://www.github.com/org/repo")
+    assert platform == "github"
+
+    # Test git+https URL with trailing .git and subpaths
+    assert parse_repo_url("git+https://github.com/org/repo.git") == ("github", "org", "repo")
+    assert parse_repo_url("https://github.com/org/repo/tree/main/docs") == ("github", "org", "repo")
+    assert parse_repo_url("https://gitlab.com/org/repo.git#readme") == ("gitlab", "org", "repo")
+    assert parse_repo_url("https://github.com/org/repo.github.io") == ("github", "org", "repo.github.io")
+
+    # Test lookalike hosts and incomplete paths
+    assert parse_repo_url("https://notgithub.com/org/repo") == (None, None, None)
+    assert parse_repo_url("https://github.com.evil.com/org/repo") == (None, None, None)
+    assert parse_repo_url("https://github.com/org") == (None, None, None)
+
     # Test invalid URL
     platform, org, repo = parse_repo_url("https://invalid.com/url")
     assert platform is None
@@ -45,6 +78,26 @@ def test_extract_repo_info():
     assert org == "org"
     assert repo == "repo"
 
+    # Test priority: Source wins over earlier Homepage and fallback URLs
+    info = {
+        "project_urls": {
+            "Changelog": "https://github.com/other/changelog",
+            "Homepage": "https://gitlab.com/home/page",
+            "Funding": "https://github.com/sponsors/org",
+            "Source": "https://github.com/org/repo"
+        }
+    }
+    url, platform, org, repo = extract_repo_info(info)
+    assert url == "https://github.com/org/repo"
+
+    # Test Homepage wins over a fallback URL, and excluded types are skipped
+    del info["project_urls"]["Source"]
+    url, platform, org, repo = extract_repo_info(info)
+    assert url == "https://gitlab.com/home/page"
+    del info["project_urls"]["Homepage"]
+    url, platform, org, repo = extract_repo_info(info)
+    assert url == "https://github.com/other/changelog"
+
     # Test with no repository info
     info = {"project_urls": {"Homepage": "https://example.com"}}
     url, platform, org, repo = extract_repo_info(info)
@@ -74,10 +127,59 @@ def test_extract_npm_repo_info():
     assert org is None
     assert repo is None
 
-# Mock responses for PyPI and NPM
-@pytest.fixture
+def test_get_latest_version_release_date():
+    # Test with files of the latest version
+    info = {
+        "info": {"version": "1.0.0"},
+        "urls": [{"upload_time_iso_8601": "2023-02-01T00:00:00Z"}],
+        "releases": {"1.0.0": [{"upload_time_iso_8601": "2023-01-01T00:00:00Z"}]}
+    }
+    assert get_latest_version_release_date(info) == "2023-02-01T00:00:00Z"
+
+    # Test falling back to the release history
+    del info["urls"]
+    assert get_latest_version_release_date(info) == "2023-01-01T00:00:00Z"
+
+    # Test with no release info
+    assert get_latest_version_release_date({"info": {"version": "1.0.0"}}) is None
+
+def test_trim_documents(mock_pypi_response, mock_npm_response):
+    pypi_document = dict(
+        mock_pypi_response,
+        info=dict(mock_pypi_response["info"], description="A long README"),
+        urls=[{"filename": "test_package-1.0.0.tar.gz", "upload_time_iso_8601": "2023-01-01T00:00:00Z"}],
+        releases={
+            "0.9.0": [{"upload_time_iso_8601": "2022-01-01T00:00:00Z"}],
+            "1.0.0": [{"upload_time_iso_8601": "2023-01-01T00:00:00Z", "size": 1024}]
+        }
+    )
+    trimmed = trim_pypi_document(pypi_document)
+    assert trimmed["info"] == {
+        "summary": "Test package",
+        "version": "1.0.0",
+        "project_urls": {"Source": "https://github.com/org/repo"}
+    }
+    assert trimmed["urls"] == [{"upload_time_iso_8601": "2023-01-01T00:00:00Z"}]
+    assert trimmed["releases"] == {"1.0.0": [{"upload_time_iso_8601": "2023-01-01T00:00:00Z"}]}
+    assert get_latest_version_release_date(trimmed) == "2023-01-01T00:00:00Z"
+    assert extract_repo_info(trimmed["info"])[1] == "github"
+
+    npm_document = dict(mock_npm_response, versions={"1.0.0": {"name": "test-package"}})
+    trimmed = trim_npm_document(npm_document)
+    assert "versions" not in trimmed
+    assert trimmed["time"] == {"1.0.0": "2023-01-01T00:00:00Z"}
+    assert extract_npm_repo_info(trimmed)[1] == "github"
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    response_cache.clear()
+    yield
+    response_cache.clear()
+
+# Mock responses for PyPI and NPM, read-only so they can be shared across tests
+@pytest.fixture(scope="module")
 def mock_pypi_response():
-    return {
+    return MappingProxyType({
         "info": {
             "name": "test-package",
             "summary": "Test package",
@@ -89,11 +191,11 @@ def mock_pypi_response():
         "releases": {
             "1.0.0": [{"upload_time_iso_8601": "2023-01-01T00:00:00Z"}]
         }
-    }
+    })
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_npm_response():
-    return {
+    return MappingProxyType({
         "name": "test-package",
         "description": "Test package",
         "dist-tags": {"latest": "1.0.0"},
@@ -104,15 +206,16 @@ def mock_npm_response():
         "repository": {
             "url": "https://github.com/org/repo"
         }
-    }
+    })
 
 # Test API endpoints
 @patch('app.get_library_info')
-def test_get_pypi_package_info(mock_get_library_info, mock_pypi_response):
-    mock_get_library_info.return_value = mock_pypi_response
+def test_get_pypi_package_info(mock_get_library_info, mock_pypi_response, client):
+    mock_get_library_info.return_value = (mock_pypi_response, False)
 
     response = client.get("/v1/pypi/test-package")
     assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "public, max-age=300"
     data = response.json()
     assert data["name"] == "test-package"
     assert data["repository_platform"] == "github"
@@ -122,8 +225,8 @@ def test_get_pypi_package_info(mock_get_library_info, mock_pypi_response):
     assert data["created_date"] == "2023-01-01T00:00:00Z"
 
 @patch('app.get_npm_info')
-def test_get_npm_package_info(mock_get_npm_info, mock_npm_response):
-    mock_get_npm_info.return_value = mock_npm_response
+def test_get_npm_package_info(mock_get_npm_info, mock_npm_response, client):
+    mock_get_npm_info.return_value = (mock_npm_response, False)
 
     response = client.get("/v1/npm/test-package")
     assert response.status_code == 200
@@ -136,24 +239,24 @@ def test_get_npm_package_info(mock_get_npm_info, mock_npm_response):
     assert data["created_date"] == "2023-01-01T00:00:00Z"
 
 @patch('app.get_library_info')
-def test_get_pypi_package_not_found(mock_get_library_info):
-    mock_get_library_info.return_value = None
+def test_get_pypi_package_not_found(mock_get_library_info, client):
+    mock_get_library_info.return_value = (None, False)
 
     response = client.get("/v1/pypi/nonexistent-package")
     assert response.status_code == 404
     assert response.json()["detail"] == "Package nonexistent-package not found on PyPI"
 
 @patch('app.get_npm_info')
-def test_get_npm_package_not_found(mock_get_npm_info):
-    mock_get_npm_info.return_value = None
+def test_get_npm_package_not_found(mock_get_npm_info, client):
+    mock_get_npm_info.return_value = (None, False)
 
     response = client.get("/v1/npm/nonexistent-package")
     assert response.status_code == 404
     assert response.json()["detail"] == "Package nonexistent-package not found on npmjs.org"
 
 @patch('app.get_library_info')
-def test_get_multiple_pypi_packages(mock_get_library_info, mock_pypi_response):
-    mock_get_library_info.return_value = mock_pypi_response
+def test_get_multiple_pypi_packages(mock_get_library_info, mock_pypi_response, client):
+    mock_get_library_info.return_value = (mock_pypi_response, False)
 
     response = client.post("/v1/pypi/batch", json=["test-package"])
     assert response.status_code == 200
@@ -163,12 +266,152 @@ def test_get_multiple_pypi_packages(mock_get_library_info, mock_pypi_response):
     assert data["packages"][0]["repository_platform"] == "github"
 
 @patch('app.get_npm_info')
-def test_get_multiple_npm_packages(mock_get_npm_info, mock_npm_response):
-    mock_get_npm_info.return_value = mock_npm_response
+def test_get_multiple_npm_packages(mock_get_npm_info, mock_npm_response, client):
+    mock_get_npm_info.return_value = (mock_npm_response, False)
 
     response = client.post("/v1/npm/batch", json=["test-package"])
     assert response.status_code == 200
     data = response.json()
     assert len(data["packages"]) == 1
     assert data["packages"][0]["name"] == "test-package"
-    assert data["packages"][0]["repository_platform"] == "github"
\ No newline at end of file
+    assert data["packages"][0]["repository_platform"] == "github"
+
+@patch('app.get_library_info')
+def test_get_multiple_pypi_packages_partial_failure(mock_get_library_info, mock_pypi_response, client):
+    async def fake_get_library_info(client, name, timeout=None):
+        if name == "bad-package":
+            raise ValueError("boom")
+        return mock_pypi_response, False
+    mock_get_library_info.side_effect = fake_get_library_info
+
+    response = client.post("/v1/pypi/batch", json=["test-package", "bad-package"])
+    assert response.status_code == 200
+    data = response.json()
+    assert [p["name"] for p in data["packages"]] == ["test-package", "bad-package"]
+    assert data["packages"][0]["error"] is False
+    assert data["packages"][1]["error"] is True
+
+def test_get_multiple_pypi_packages_times_out_slow_entries(mock_pypi_response, client, monkeypatch):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.2)
+        return httpx.Response(503)
+    monkeypatch.setattr("app.http_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr("app.BATCH_ITEM_TIMEOUT", 0.05)
+    monkeypatch.setattr("app.RETRY_BACKOFF", 0)
+    response_cache.set("https://pypi.org/pypi/cached-package/json", dict(mock_pypi_response), ttl=0)
+
+    response = client.post("/v1/pypi/batch", json=["cached-package", "slow-package"])
+    assert response.status_code == 200
+    data = response.json()
+    # A slow entry is served from the stale cache if possible, otherwise reported as an error
+    assert [(p["error"], p["stale"]) for p in data["packages"]] == [(False, True), (True, False)]
+    assert data["packages"][0]["repository_name"] == "repo"
+
+def test_get_pypi_package_info_serves_stale_document(mock_pypi_response, client, monkeypatch):
+    monkeypatch.setattr("app.http_client", httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(503))))
+    monkeypatch.setattr("app.RETRY_BACKOFF", 0)
+    response_cache.set("https://pypi.org/pypi/test-package/json", dict(mock_pypi_response), ttl=0)
+
+    response = client.get("/v1/pypi/test-package")
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert response.json()["stale"] is True
+
+@pytest.mark.asyncio
+async def test_fetch_json_caches_and_revalidates(monkeypatch):
+    seen_etags = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_etags.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"name": "test-package"}, headers={"ETag": '"v1"'})
+
+    url = "https://pypi.test/test-package"
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        assert await fetch_json(http, url) == ({"name": "test-package"}, False)
+        # Fresh entries are served without contacting upstream
+        assert await fetch_json(http, url) == ({"name": "test-package"}, False)
+        assert seen_etags == [None]
+
+        # Expired entries are revalidated with their ETag
+        monkeypatch.setattr(response_cache, "ttl", 0)
+        response_cache.set(url, {"name": "test-package"}, '"v1"')
+        assert await fetch_json(http, url) == ({"name": "test-package"}, False)
+        assert seen_etags == [None, '"v1"']
+
+@patch('app.get_npm_info')
+def test_get_multiple_npm_packages_deduplicates(mock_get_npm_info, mock_npm_response, client):
+    mock_get_npm_info.return_value = (mock_npm_response, False)
+
+    response = client.post("/v1/npm/batch", json=["test-package", "other-package", "test-package"])
+    assert response.status_code == 200
+    data = response.json()
+    assert [p["name"] for p in data["packages"]] == ["test-package", "other-package", "test-package"]
+    assert mock_get_npm_info.call_count == 2
+
+@pytest.mark.asyncio
+async def test_host_throttle_honours_rate_limit_headers(monkeypatch):
+    throttle = HostThrottle(2)
+    throttle.update(200, {"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "60"})
+    assert throttle._resume_at == 0.0
+
+    throttle.update(429, {"Retry-After": "5"})
+    assert throttle._resume_at > 0
+
+    delays = []
+    async def fake_sleep(delay):
+        delays.append(delay)
+    monkeypatch.setattr("app.asyncio.sleep", fake_sleep)
+    async with throttle:
+        pass
+    assert len(delays) == 1 and 0 < delays[0] <= 5
+
+@pytest.mark.asyncio
+async def test_fetch_json_collapses_concurrent_misses_and_caches_not_found():
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        if request.url.path == "/missing":
+            return httpx.Response(404)
+        return httpx.Response(200, json={"name": "test-package"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        results = await asyncio.gather(*[fetch_json(http, "https://pypi.test/test-package") for _ in range(5)])
+        assert results == [({"name": "test-package"}, False)] * 5
+        assert requested == ["/test-package"]
+
+        assert await fetch_json(http, "https://pypi.test/missing") == (None, False)
+        assert await fetch_json(http, "https://pypi.test/missing") == (None, False)
+        assert requested == ["/test-package", "/missing"]
+
+@pytest.mark.asyncio
+async def test_fetch_json_serves_stale_document_when_upstream_fails(monkeypatch):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503)
+
+    monkeypatch.setattr("app.RETRY_BACKOFF", 0)
+    url = "https://pypi.test/test-package"
+    response_cache.set(url, {"name": "test-package"}, ttl=0)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        assert await fetch_json(http, url) == ({"name": "test-package"}, True)
+
+        # Entries expired for longer than STALE_TTL are not served
+        monkeypatch.setattr("app.STALE_TTL", 0)
+        assert await fetch_json(http, url) == (None, False)
+
+@pytest.mark.asyncio
+async def test_get_library_info_follows_canonical_name_redirect(mock_pypi_response):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/pypi/django/json":
+            return httpx.Response(301, headers={"Location": "https://pypi.org/pypi/Django/json"})
+        return httpx.Response(200, json=dict(mock_pypi_response))
+
+    async with create_http_client(httpx.MockTransport(handler)) as http:
+        info, stale = await get_library_info(http, "django")
+
+    assert stale is False
+    assert info["info"]["version"] == "1.0.0"
@@ -1,10 +1,16 @@
 from fastapi import FastAPI, HTTPException, APIRouter
-from typing import List, Dict, Optional
+from fastapi.responses import ORJSONResponse
+from typing import Any, List, Dict, Mapping, Optional, Tuple
 from pydantic import BaseModel, HttpUrl
 from datetime import datetime, timezone
-import requests
-from urllib.parse import urlparse
+from collections import OrderedDict
+from contextlib import asynccontextmanager, nullcontext
+from functools import lru_cache
+import asyncio
+import httpx
+import orjson
 import re
+import time
 from dotenv import load_dotenv
 import os
 
@@ -20,24 +26,97 @@ GITHUB_API_BASE = "https://api.github.com"
 GITLAB_API_BASE = "https://gitlab.com/api/v4"
 README_FILES = ["README.md", "README.rst", "README.txt", "README"]
 LICENSE_FILES = ["LICENSE", "LICENSE.md", "COPYING", "COPYING.md"]
+README_FILES_SET = frozenset(README_FILES)
+LICENSE_FILES_SET = frozenset(LICENSE_FILES)
+
+# Upstream request settings
+REQUEST_TIMEOUT = httpx.Timeout(10, connect=3.05)
+USER_AGENT = "health-repo-health-check (+https://github.com/zchryr/health)"
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+
+# Per-host concurrency limits and the longest pause honoured for an exhausted rate limit
+HOST_CONCURRENCY = {"api.github.com": 30, "gitlab.com": 30}
+MAX_RATE_LIMIT_WAIT = 30
+
+# Upstream hosts whose connections are opened at startup
+PREWARM_URLS = [GITHUB_API_BASE, GITLAB_API_BASE]
+
+# Health check result cache settings
+CACHE_TTL = 300
+CACHE_MAXSIZE = 4096
+
+# Warning added when the GitHub issue search fails and the issue count includes pull requests
+SEARCH_FALLBACK_WARNING = "Open issue count includes pull requests; GitHub issue search was unavailable"
+
+# Validation pattern for owner and repository names
+_NAME_RE = re.compile(r"\A[a-zA-Z0-9_-]+\Z")
+
+# Supported repository hosts and their platform names
+_HOST_PLATFORMS = {
+    "github.com": "github",
+    "gitlab.com": "gitlab",
+}
+
+# Plain https://host/ prefixes, parsed without the regex since nearly all URLs take this form
+_REPO_URL_PREFIXES = (
+    ("https://github.com/", "github"),
+    ("https://gitlab.com/", "gitlab"),
+)
+
+# Repository URL: either scp-style git@host:owner/repo or scheme://[userinfo@]host[:port]/owner/repo,
+# where host is a supported host or one of its subdomains, with an optional trailing .git
+_REPO_URL_RE = re.compile(
+    r"\A(?:git@(?:[^/?#:@]+\.)?(github\.com|gitlab\.com):"
+    r"|(?:git\+)?[a-z][a-z0-9+.-]*://(?:[^@/?#]*@)?(?:[^/?#:@]+\.)?(github\.com|gitlab\.com)(?::\d*)?/+)"
+    r"([^/?#:]+)/([^/?#:]+?)(?:\.git)?(?:[/?#]|\Z)",
+    re.IGNORECASE
+)
 
+class ResultCache:
+    """
+    Least-recently-used cache whose entries expire after a fixed time-to-live.
+    """
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Tuple, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+health_cache = ResultCache(CACHE_MAXSIZE, CACHE_TTL)
+
+@lru_cache(maxsize=1024)
 def parse_iso8601_timestamp(timestamp: str) -> datetime:
     """
     Parse an ISO 8601 timestamp string into a timezone-aware datetime object.
     Handles both GitHub and GitLab timestamp formats.
     """
+    normalized = timestamp[:-1] + "+00:00" if timestamp.endswith("Z") else timestamp
     try:
-        # Try parsing with microseconds (GitLab format)
-        dt = datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S.%fZ")
+        dt = datetime.fromisoformat(normalized)
     except ValueError:
-        try:
-            # Try parsing without microseconds (GitHub format)
-            dt = datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ")
-        except ValueError:
-            raise ValueError(f"Invalid ISO 8601 timestamp format: {timestamp}")
+        raise ValueError(f"Invalid ISO 8601 timestamp format: {timestamp}") from None
 
     # Make the datetime timezone-aware
-    return dt.replace(tzinfo=timezone.utc)
+    if not dt.tzinfo:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
 
 def format_iso8601_timestamp(dt: datetime) -> str:
     """
@@ -47,11 +126,128 @@ def format_iso8601_timestamp(dt: datetime) -> str:
         dt = dt.replace(tzinfo=timezone.utc)
     return dt.isoformat()
 
+class HostThrottle:
+    """
+    Bounds concurrent requests to one upstream host and pauses new requests
+    while the host reports its rate limit as exhausted.
+    """
+    def __init__(self, max_concurrency: int):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._resume_at = 0.0
+
+    async def __aenter__(self) -> "HostThrottle":
+        await self._semaphore.acquire()
+        delay = self._resume_at - time.monotonic()
+        # Waits longer than MAX_RATE_LIMIT_WAIT are not worth holding a request for
+        if 0 < delay <= MAX_RATE_LIMIT_WAIT:
+            await asyncio.sleep(delay)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._semaphore.release()
+
+    def update(self, status: int, headers: Mapping[str, str]) -> None:
+        """
+        Record the rate limit state advertised in an upstream response.
+        """
+        delay = None
+        retry_after = headers.get("Retry-After")
+        remaining = headers.get("X-RateLimit-Remaining") or headers.get("RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset") or headers.get("RateLimit-Reset")
+        if status == 429 and retry_after and retry_after.isdigit():
+            delay = int(retry_after)
+        elif remaining == "0" and reset and reset.isdigit():
+            # Reset is either an epoch timestamp or a number of seconds from now
+            delay = int(reset) - time.time() if int(reset) > 1_000_000_000 else int(reset)
+        if delay is not None:
+            self._resume_at = max(self._resume_at, time.monotonic() + max(delay, 0))
+
+class RetryTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper that retries transient upstream failures with exponential backoff,
+    throttling each attempt through the throttle of its host, if any.
+    """
+    def __init__(self, transport: httpx.AsyncBaseTransport, throttles: Optional[Dict[str, HostThrottle]] = None):
+        self._transport = transport
+        self._throttles = throttles or {}
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        throttle = self._throttles.get(request.url.host)
+        async with throttle or nullcontext():
+            response = await self._transport.handle_async_request(request)
+        # The GitHub search API has its own, much smaller quota; exhausting it must not
+        # pause the other requests to the host
+        if throttle and not request.url.path.startswith("/search/"):
+            throttle.update(response.status_code, response.headers)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # Search failures already have a fallback, and retrying them only burns the small quota
+        if request.url.path.startswith("/search/"):
+            return await self._send(request)
+        for attempt in range(MAX_RETRIES):
+            response = await self._send(request)
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            await response.aclose()
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+        return await self._send(request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+# Shared HTTP client, created in the app lifespan and reused across requests
+http_client: Optional[httpx.AsyncClient] = None
+
+async def prewarm_connections(client: httpx.AsyncClient) -> None:
+    """
+    Resolve and connect to each upstream host so the first requests skip DNS and TLS setup.
+    Failures are ignored; the connection is simply opened on first use instead.
+    """
+    async def prewarm(url: str) -> None:
+        try:
+            await client.head(url)
+        except httpx.HTTPError:
+            pass
+
+    await asyncio.gather(*[prewarm(url) for url in PREWARM_URLS])
+
+def create_http_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """
+    Create the HTTP client used for upstream requests; transport overrides the network transport.
+    """
+    return httpx.AsyncClient(
+        headers={"User-Agent": USER_AGENT},
+        # Renamed and transferred GitHub repositories answer with a redirect to their new location
+        follow_redirects=True,
+        timeout=REQUEST_TIMEOUT,
+        transport=RetryTransport(transport or httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=MAX_RETRIES,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        ), throttles={host: HostThrottle(limit) for host, limit in HOST_CONCURRENCY.items()})
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open the shared HTTP client on startup and close it on shutdown.
+    """
+    global http_client
+    http_client = create_http_client()
+    prewarm_task = asyncio.create_task(prewarm_connections(http_client))
+    yield
+    prewarm_task.cancel()
+    await http_client.aclose()
+    http_client = None
+
 # Create the main FastAPI app
 app = FastAPI(
     title="Repository Health Checker",
     description="API to perform health checks on GitHub and GitLab repositories",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Create a router for v1
@@ -107,16 +303,30 @@ def get_gitlab_headers(token: Optional[str] = None) -> Dict[str, str]:
         headers["PRIVATE-TOKEN"] = token
     return headers
 
-def check_github_health(owner: str, repo: str, token: Optional[str] = None) -> HealthCheckResult:
+async def get_optional(client: httpx.AsyncClient, url: str, **kwargs: Any) -> Optional[httpx.Response]:
+    """
+    Send a GET request whose result is optional, returning None instead of raising if it fails.
+    """
+    try:
+        return await client.get(url, **kwargs)
+    except httpx.HTTPError:
+        return None
+
+async def check_github_health(client: httpx.AsyncClient, owner: str, repo: str, token: Optional[str] = None) -> HealthCheckResult:
     """
     Perform health checks on a GitHub repository.
     """
     # Validate owner and repo parameters
-    if not re.match(r"^[a-zA-Z0-9_-]+$", owner):
+    if not _NAME_RE.match(owner):
         raise ValueError("Invalid owner format. Only alphanumeric characters, dashes, and underscores are allowed.")
-    if not re.match(r"^[a-zA-Z0-9_-]+$", repo):
+    if not _NAME_RE.match(repo):
         raise ValueError("Invalid repo format. Only alphanumeric characters, dashes, and underscores are allowed.")
 
+    cache_key = ("github", owner, repo)
+    cached = health_cache.get(cache_key)
+    if cached:
+        return cached.model_copy(deep=True)
+
     headers = get_github_headers(token)
     result = HealthCheckResult(
         repository_url=f"https://github.com/{owner}/{repo}",
@@ -126,11 +336,20 @@ def check_github_health(owner: str, repo: str, token: Optional[str] = None) -> H
     )
 
     try:
-        # Get repository info
+        # Fetch repository info and issues, and probe README and LICENSE, concurrently
         repo_url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}"
-        repo_response = requests.get(repo_url, headers=headers)
+        issues_url = f"{GITHUB_API_BASE}/search/issues"
+        issues_params = {"q": f"repo:{owner}/{repo} is:issue is:open", "per_page": 1}
+        readme_url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/readme"
+        license_url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/license"
+        repo_response, issues_response, readme_response, license_response = await asyncio.gather(
+            client.get(repo_url, headers=headers),
+            get_optional(client, issues_url, headers=headers, params=issues_params),
+            client.head(readme_url, headers=headers),
+            client.head(license_url, headers=headers)
+        )
         repo_response.raise_for_status()
-        repo_data = repo_response.json()
+        repo_data = orjson.loads(repo_response.content)
 
         # Get last activity
         result.last_activity = repo_data.get("pushed_at")
@@ -145,49 +364,54 @@ def check_github_health(owner: str, repo: str, token: Optional[str] = None) -> H
             elif result.days_since_last_activity > 90:
                 result.warnings.append("Repository has been inactive for over 90 days")
 
-        # Get issue count
-        issues_url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/issues"
-        issues_response = requests.get(issues_url, headers=headers)
-        issues_response.raise_for_status()
-        result.open_issues_count = len(issues_response.json())
+        # Get open issue count from the search total rather than a page of issues.
+        # The search API has a much smaller rate limit, so when it fails fall back to the
+        # repository's open_issues_count, which also counts pull requests
+        if issues_response is not None and issues_response.is_success:
+            result.open_issues_count = orjson.loads(issues_response.content).get("total_count")
+        else:
+            result.open_issues_count = repo_data.get("open_issues_count")
+            result.warnings.append(SEARCH_FALLBACK_WARNING)
 
         # Get stars and forks
         result.stars_count = repo_data.get("stargazers_count", 0)
         result.forks_count = repo_data.get("forks_count", 0)
 
-        # Check for README and LICENSE
-        contents_url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/contents"
-        contents_response = requests.get(contents_url, headers=headers)
-        if contents_response.status_code == 200:
-            contents = contents_response.json()
-            result.has_readme = any(file["name"] in README_FILES for file in contents)
-            result.has_license = any(file["name"] in LICENSE_FILES for file in contents)
-
-            if not result.has_readme:
-                result.warnings.append("No README file found")
-                result.is_healthy = False
-            if not result.has_license:
-                result.warnings.append("No LICENSE file found")
-                result.is_healthy = False
+        # Check for README and LICENSE; only a 404 means the file is missing
+        result.has_readme = readme_response.status_code == 200
+        result.has_license = license_response.status_code == 200
+        if readme_response.status_code == 404:
+            result.warnings.append("No README file found")
+            result.is_healthy = False
+        if license_response.status_code == 404:
+            result.warnings.append("No LICENSE file found")
+            result.is_healthy = False
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         result.errors.append(f"Error checking GitHub repository: {str(e)}")
         result.is_healthy = False
 
+    if not result.errors:
+        health_cache.set(cache_key, result.model_copy(deep=True))
     return result
 
-def check_gitlab_health(owner: str, repo: str, token: Optional[str] = None) -> HealthCheckResult:
+async def check_gitlab_health(client: httpx.AsyncClient, owner: str, repo: str, token: Optional[str] = None) -> HealthCheckResult:
     """
     Perform health checks on a GitLab repository.
     """
     # Validate the owner parameter
-    if not re.match(r"^[a-zA-Z0-9_-]+$", owner):
+    if not _NAME_RE.match(owner):
         raise ValueError("Invalid owner parameter. Only alphanumeric characters, dashes, and underscores are allowed.")
 
     # Validate the repo parameter
-    if not re.match(r"^[a-zA-Z0-9_-]+$", repo):
+    if not _NAME_RE.match(repo):
         raise ValueError("Invalid repo parameter. Only alphanumeric characters, dashes, and underscores are allowed.")
 
+    cache_key = ("gitlab", owner, repo)
+    cached = health_cache.get(cache_key)
+    if cached:
+        return cached.model_copy(deep=True)
+
     headers = get_gitlab_headers(token)
     result = HealthCheckResult(
         repository_url=f"https://gitlab.com/{owner}/{repo}",
@@ -197,11 +421,16 @@ def check_gitlab_health(owner: str, repo: str, token: Optional[str] = None) -> H
     )
 
     try:
-        # Get project info
+        # Fetch project info and issues concurrently
         project_url = f"{GITLAB_API_BASE}/projects/{owner}%2F{repo}"
-        project_response = requests.get(project_url, headers=headers)
+        issues_url = f"{GITLAB_API_BASE}/projects/{owner}%2F{repo}/issues"
+        issues_params = {"state": "opened", "per_page": 1}
+        project_response, issues_response = await asyncio.gather(
+            client.get(project_url, headers=headers),
+            get_optional(client, issues_url, headers=headers, params=issues_params)
+        )
         project_response.raise_for_status()
-        project_data = project_response.json()
+        project_data = orjson.loads(project_response.content)
 
         # Get last activity
         result.last_activity = project_data.get("last_activity_at")
@@ -216,80 +445,67 @@ def check_gitlab_health(owner: str, repo: str, token: Optional[str] = None) -> H
             elif result.days_since_last_activity > 90:
                 result.warnings.append("Repository has been inactive for over 90 days")
 
-        # Get issue count
-        issues_url = f"{GITLAB_API_BASE}/projects/{owner}%2F{repo}/issues"
-        issues_response = requests.get(issues_url, headers=headers)
-        issues_response.raise_for_status()
-        result.open_issues_count = len(issues_response.json())
+        # Get open issue count from the pagination total rather than a page of issues.
+        # GitLab omits X-Total for very large result sets, so fall back to the project's count
+        total = issues_response.headers.get("X-Total") if issues_response is not None and issues_response.is_success else None
+        result.open_issues_count = int(total) if total else project_data.get("open_issues_count")
 
         # Get stars and forks
         result.stars_count = project_data.get("star_count", 0)
         result.forks_count = project_data.get("forks_count", 0)
 
-        # Check for README and LICENSE using /repository/files/:file_path endpoint on default branch
+        # Check for README and LICENSE with a single listing of the default branch root
         default_branch = project_data.get("default_branch", "master")
-        # Check README
-        result.has_readme = False
-        for readme_name in README_FILES:
-            file_url = f"{GITLAB_API_BASE}/projects/{owner}%2F{repo}/repository/files/{requests.utils.quote(readme_name, safe='')}"
-            params = {"ref": default_branch}
-            file_response = requests.get(file_url, headers=headers, params=params)
-            if file_response.status_code == 200:
-                result.has_readme = True
+        tree_url = f"{GITLAB_API_BASE}/projects/{owner}%2F{repo}/repository/tree"
+        params = {"ref": default_branch, "per_page": 100}
+        names = set()
+        while True:
+            tree_response = await client.get(tree_url, headers=headers, params=params)
+            if tree_response.status_code != 200:
                 break
+            names.update(item["name"] for item in orjson.loads(tree_response.content))
+            next_page = tree_response.headers.get("X-Next-Page")
+            if not next_page or (names & README_FILES_SET and names & LICENSE_FILES_SET):
+                break
+            params["page"] = next_page
+        # Check README
+        result.has_readme = bool(names & README_FILES_SET)
         if not result.has_readme:
             result.warnings.append("No README file found")
             result.is_healthy = False
         # Check LICENSE
-        result.has_license = False
-        for license_name in LICENSE_FILES:
-            file_url = f"{GITLAB_API_BASE}/projects/{owner}%2F{repo}/repository/files/{requests.utils.quote(license_name, safe='')}"
-            params = {"ref": default_branch}
-            file_response = requests.get(file_url, headers=headers, params=params)
-            if file_response.status_code == 200:
-                result.has_license = True
-                break
+        result.has_license = bool(names & LICENSE_FILES_SET)
         if not result.has_license:
             result.warnings.append("No LICENSE file found")
             result.is_healthy = False
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         result.errors.append(f"Error checking GitLab repository: {str(e)}")
         result.is_healthy = False
 
+    if not result.errors:
+        health_cache.set(cache_key, result.model_copy(deep=True))
     return result
 
+@lru_cache(maxsize=4096)
 def parse_repo_url(url: str):
     """
     Parse a repository URL to extract platform, owner, and repository name.
     """
-    if url.startswith('git@'):
-        parts = url.split(':')
-        if len(parts) != 2:
-            return None, None, None
-        path = parts[1]
-        domain = url.split('@')[1].split(':')[0]
-        if domain.endswith('.github.com') or domain == 'github.com':
-            platform = 'github'
-        elif domain.endswith('.gitlab.com') or domain == 'gitlab.com':
-            platform = 'gitlab'
-        else:
-            return None, None, None
-    else:
-        parsed_url = urlparse(url)
-        path = parsed_url.path.strip('/')
-        if parsed_url.netloc.endswith('.github.com') or parsed_url.netloc == 'github.com':
-            platform = 'github'
-        elif parsed_url.netloc.endswith('.gitlab.com') or parsed_url.netloc == 'gitlab.com':
-            platform = 'gitlab'
-        else:
-            return None, None, None
+    # Fast path for plain https URLs; anything unusual falls through to the regex
+    if "?" not in url and "#" not in url:
+        for prefix, platform in _REPO_URL_PREFIXES:
+            if url.startswith(prefix):
+                owner, _, tail = url[len(prefix):].partition("/")
+                repo = tail.partition("/")[0].removesuffix(".git")
+                if owner and repo and ":" not in owner and ":" not in repo:
+                    return platform, owner, repo
+                break
 
-    parts = path.split('/')
-    if len(parts) >= 2:
-        owner = parts[0]
-        repo = parts[1].replace('.git', '')
-        return platform, owner, repo
+    match = _REPO_URL_RE.match(url)
+    if match:
+        scp_host, host, owner, repo = match.groups()
+        return _HOST_PLATFORMS[(scp_host or host).lower()], owner, repo
 
     return None, None, None
 
@@ -321,7 +537,7 @@ async def check_github_repo(
     """
     Check health of a GitHub repository.
     """
-    return check_github_health(owner, repo, GITHUB_TOKEN)
+    return await check_github_health(http_client, owner, repo, GITHUB_TOKEN)
 
 @gitlab_router.get("/{owner}/{repo}", response_model=HealthCheckResult)
 async def check_gitlab_repo(
@@ -331,7 +547,7 @@ async def check_gitlab_repo(
     """
     Check health of a GitLab repository.
     """
-    return check_gitlab_health(owner, repo, GITLAB_TOKEN)
+    return await check_gitlab_health(http_client, owner, repo, GITLAB_TOKEN)
 
 @v1_router.post("/check", response_model=HealthCheckResponse)
 async def check_repository(
@@ -358,14 +574,58 @@ async def check_repository(
         raise HTTPException(status_code=400, detail="Invalid repository URL or path")
 
     if platform == "github":
-        result = check_github_health(owner, repo, GITHUB_TOKEN)
+        result = await check_github_health(http_client, owner, repo, GITHUB_TOKEN)
     elif platform == "gitlab":
-        result = check_gitlab_health(owner, repo, GITLAB_TOKEN)
+        result = await check_gitlab_health(http_client, owner, repo, GITLAB_TOKEN)
     else:
         raise HTTPException(status_code=400, detail="Unsupported repository platform")
 
     return HealthCheckResponse(results=[result])
 
+async def check_repository_request(repo_req: RepoCheckRequest) -> HealthCheckResult:
+    """
+    Check health of a single repository from a batch request entry.
+    """
+    repository_url = repo_req.repository_url
+    repository_path = repo_req.repository_path
+    if not repository_url and not repository_path:
+        return HealthCheckResult.model_construct(
+            repository_url=repository_url or repository_path or "",
+            platform="",
+            owner="",
+            repo_name="",
+            errors=["Either repository_url or repository_path must be provided"],
+            is_healthy=False
+        )
+    platform = None
+    owner = None
+    repo = None
+    if repository_url:
+        platform, owner, repo = parse_repo_url(repository_url)
+    elif repository_path:
+        platform, owner, repo = parse_repo_path(repository_path)
+    if not all([platform, owner, repo]):
+        return HealthCheckResult.model_construct(
+            repository_url=repository_url or repository_path or "",
+            platform=platform or "",
+            owner=owner or "",
+            repo_name=repo or "",
+            errors=["Invalid repository URL or path"],
+            is_healthy=False
+        )
+    if platform == "github":
+        return await check_github_health(http_client, owner, repo, GITHUB_TOKEN)
+    elif platform == "gitlab":
+        return await check_gitlab_health(http_client, owner, repo, GITLAB_TOKEN)
+    return HealthCheckResult.model_construct(
+        repository_url=repository_url or repository_path or "",
+        platform=platform or "",
+        owner=owner or "",
+        repo_name=repo or "",
+        errors=["Unsupported repository platform"],
+        is_healthy=False
+    )
+
 @v1_router.post("/check/batch", response_model=HealthCheckResponse)
 async def check_repositories_batch(
     body: RepoBatchCheckRequest
@@ -373,52 +633,9 @@ async def check_repositories_batch(
     """
     Check health of multiple repositories using either URL or path for each.
     """
-    results = []
-    for repo_req in body.repos:
-        repository_url = repo_req.repository_url
-        repository_path = repo_req.repository_path
-        if not repository_url and not repository_path:
-            results.append(HealthCheckResult(
-                repository_url=repository_url or repository_path or "",
-                platform="",
-                owner="",
-                repo_name="",
-                errors=["Either repository_url or repository_path must be provided"],
-                is_healthy=False
-            ))
-            continue
-        platform = None
-        owner = None
-        repo = None
-        if repository_url:
-            platform, owner, repo = parse_repo_url(repository_url)
-        elif repository_path:
-            platform, owner, repo = parse_repo_path(repository_path)
-        if not all([platform, owner, repo]):
-            results.append(HealthCheckResult(
-                repository_url=repository_url or repository_path or "",
-                platform=platform or "",
-                owner=owner or "",
-                repo_name=repo or "",
-                errors=["Invalid repository URL or path"],
-                is_healthy=False
-            ))
-            continue
-        if platform == "github":
-            result = check_github_health(owner, repo, GITHUB_TOKEN)
-        elif platform == "gitlab":
-            result = check_gitlab_health(owner, repo, GITLAB_TOKEN)
-        else:
-            result = HealthCheckResult(
-                repository_url=repository_url or repository_path or "",
-                platform=platform or "",
-                owner=owner or "",
-                repo_name=repo or "",
-                errors=["Unsupported repository platform"],
-                is_healthy=False
-            )
-        results.append(result)
-    return HealthCheckResponse(results=results)
+    results = await asyncio.gather(*[check_repository_request(repo_req) for repo_req in body.repos])
+    # Results are built by the health checks themselves, so skip response re-validation
+    return ORJSONResponse({"results": [result.model_dump() for result in results]})
 
 # Include the routers
 v1_router.include_router(github_router)
@@ -1,19 +1,21 @@
 import pytest
-from fastapi.testclient import TestClient
+import httpx
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timezone
 from app import (
-    app,
+    create_http_client,
     parse_repo_url,
     parse_repo_path,
     parse_iso8601_timestamp,
     format_iso8601_timestamp,
     check_github_health,
-    check_gitlab_health
+    check_gitlab_health,
+    RetryTransport,
+    HostThrottle,
+    HealthCheckResult,
+    health_cache
 )
 
-client = TestClient(app)
-
 # Test utility functions
 def test_parse_repo_url():
     # Test GitHub URL
@@ -28,11 +30,18 @@ def test_parse_repo_url():
     assert owner == "org"
     assert repo == "repo"
 
+    # Test SSH URL
+    assert parse_repo_url("git@github.com:org/repo.git") == ("github", "org", "repo")
+
+    # Only a trailing .git is stripped from the repository name
+    assert parse_repo_url("https://github.com/org/repo.github.io") == ("github", "org", "repo.github.io")
+
     # Test invalid URL
     platform, owner, repo = parse_repo_url("https://invalid.com/url")
     assert platform is None
     assert owner is None
     assert repo is None
+    assert parse_repo_url("https://github.com.evil.com/org/repo") == (None, None, None)
 
 def test_parse_repo_path():
     # Test GitHub path
@@ -87,6 +96,12 @@ def test_format_iso8601_timestamp():
     formatted = format_iso8601_timestamp(dt)
     assert formatted == "2023-01-01T00:00:00+00:00"
 
+@pytest.fixture(autouse=True)
+def clear_health_cache():
+    health_cache.clear()
+    yield
+    health_cache.clear()
+
 # Mock responses for GitHub and GitLab
 @pytest.fixture
 def mock_github_response():
@@ -108,7 +123,7 @@ def mock_gitlab_response():
 
 # Test API endpoints
 @patch('app.check_github_health')
-def test_check_github_repo(mock_check_github_health):
+def test_check_github_repo(mock_check_github_health, client):
     mock_result = {
         "repository_url": "https://github.com/org/repo",
         "platform": "github",
@@ -136,7 +151,7 @@ def test_check_github_repo(mock_check_github_health):
     assert data["is_healthy"] is True
 
 @patch('app.check_gitlab_health')
-def test_check_gitlab_repo(mock_check_gitlab_health):
+def test_check_gitlab_repo(mock_check_gitlab_health, client):
     mock_result = {
         "repository_url": "https://gitlab.com/org/repo",
         "platform": "gitlab",
@@ -164,7 +179,7 @@ def test_check_gitlab_repo(mock_check_gitlab_health):
     assert data["is_healthy"] is True
 
 @patch('app.check_github_health')
-def test_check_repository_with_url(mock_check_github_health):
+def test_check_repository_with_url(mock_check_github_health, client):
     mock_result = {
         "repository_url": "https://github.com/org/repo",
         "platform": "github",
@@ -192,7 +207,7 @@ def test_check_repository_with_url(mock_check_github_health):
 
 @patch('app.check_github_health')
 @patch('app.check_gitlab_health')
-def test_check_repositories_batch(mock_check_gitlab_health, mock_check_github_health):
+def test_check_repositories_batch(mock_check_gitlab_health, mock_check_github_health, client):
     mock_github_result = {
         "repository_url": "https://github.com/org1/repo1",
         "platform": "github",
@@ -207,8 +222,8 @@ def test_check_repositories_batch(mock_check_gitlab_health, mock_check_github_he
         "repo_name": "repo2",
         "is_healthy": True
     }
-    mock_check_github_health.return_value = mock_github_result
-    mock_check_gitlab_health.return_value = mock_gitlab_result
+    mock_check_github_health.return_value = HealthCheckResult(**mock_github_result)
+    mock_check_gitlab_health.return_value = HealthCheckResult(**mock_gitlab_result)
 
     response = client.post("/v1/check/batch", json={
         "repos": [
@@ -223,12 +238,207 @@ def test_check_repositories_batch(mock_check_gitlab_health, mock_check_github_he
     assert data["results"][1]["platform"] == "gitlab"
     assert all(result["is_healthy"] for result in data["results"])
 
-def test_check_repository_invalid_url():
+def test_check_repository_invalid_url(client):
     response = client.post("/v1/check", json={"repository_url": "invalid-url"})
     assert response.status_code == 400
     assert "Invalid repository URL" in response.json()["detail"]
 
-def test_check_repository_missing_params():
+def test_check_repository_missing_params(client):
     response = client.post("/v1/check", json={})
     assert response.status_code == 400
-    assert "Either repository_url or repository_path must be provided" in response.json()["detail"]
\ No newline at end of file
+    assert "Either repository_url or repository_path must be provided" in response.json()["detail"]
+
+@pytest.mark.asyncio
+async def test_check_gitlab_health(mock_gitlab_response):
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/issues"):
+            assert request.url.params["state"] == "opened"
+            return httpx.Response(200, json=[{"id": 1}], headers={"X-Total": "42"})
+        if path.endswith("/repository/tree"):
+            return httpx.Response(200, json=[
+                {"name": "src", "type": "tree"},
+                {"name": "README.md", "type": "blob"},
+                {"name": "LICENSE", "type": "blob"}
+            ])
+        return httpx.Response(200, json=mock_gitlab_response)
+
+    requests_seen = []
+    def counting_handler(request: httpx.Request) -> httpx.Response:
+        requests_seen.append(request.url.path)
+        return handler(request)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(counting_handler)) as http:
+        result = await check_gitlab_health(http, "org", "repo")
+        request_count = len(requests_seen)
+        # A repeated check is served from the cache
+        cached_result = await check_gitlab_health(http, "org", "repo")
+
+    assert len(requests_seen) == request_count
+    assert cached_result == result
+
+    assert result.platform == "gitlab"
+    assert result.open_issues_count == 42
+    assert result.stars_count == 100
+    assert result.has_readme is True
+    assert result.has_license is True
+    assert result.errors == []
+
+@pytest.mark.asyncio
+async def test_retry_transport_retries_transient_errors(monkeypatch):
+    monkeypatch.setattr("app.RETRY_BACKOFF", 0)
+    statuses = iter([503, 429, 200])
+    transport = RetryTransport(httpx.MockTransport(lambda request: httpx.Response(next(statuses))))
+
+    async with httpx.AsyncClient(transport=transport) as http:
+        response = await http.get("https://api.github.com/repos/org/repo")
+
+    assert response.status_code == 200
+
+@pytest.mark.asyncio
+async def test_check_github_health(mock_github_response):
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/search/issues"):
+            assert request.url.params["q"] == "repo:org/repo is:issue is:open"
+            return httpx.Response(200, json={"total_count": 7, "items": [{"id": 1}]})
+        if path.endswith("/readme"):
+            return httpx.Response(200)
+        if path.endswith("/license"):
+            return httpx.Response(404)
+        return httpx.Response(200, json=mock_github_response)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        result = await check_github_health(http, "org", "repo")
+
+    assert result.platform == "github"
+    assert result.open_issues_count == 7
+    assert result.stars_count == 100
+    assert result.has_readme is True
+    assert result.has_license is False
+    assert "No LICENSE file found" in result.warnings
+    assert result.is_healthy is False
+
+def test_check_repositories_batch_invalid_entries(client):
+    response = client.post("/v1/check/batch", json={
+        "repos": [
+            {},
+            {"repository_url": "https://invalid.com/url"}
+        ]
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data["results"][0]["errors"] == ["Either repository_url or repository_path must be provided"]
+    assert data["results"][1]["errors"] == ["Invalid repository URL or path"]
+    assert not any(result["is_healthy"] for result in data["results"])
+    assert data["results"][1]["warnings"] == []
+
+@pytest.mark.asyncio
+async def test_retry_transport_records_rate_limits():
+    throttle = HostThrottle(1)
+    headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "5"}
+    transport = RetryTransport(
+        httpx.MockTransport(lambda request: httpx.Response(200, headers=headers)),
+        throttles={"api.github.com": throttle}
+    )
+
+    async with httpx.AsyncClient(transport=transport) as http:
+        response = await http.get("https://api.github.com/repos/org/repo")
+
+    assert response.status_code == 200
+    assert throttle._resume_at > 0
+
+@pytest.mark.asyncio
+async def test_check_github_health_falls_back_when_search_is_rate_limited(mock_github_response):
+    throttle = HostThrottle(4)
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/search/issues"):
+            return httpx.Response(403, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "60"})
+        if path.endswith("/readme") or path.endswith("/license"):
+            return httpx.Response(200)
+        return httpx.Response(200, json=dict(mock_github_response, open_issues_count=3))
+
+    transport = RetryTransport(httpx.MockTransport(handler), throttles={"api.github.com": throttle})
+    async with httpx.AsyncClient(transport=transport) as http:
+        result = await check_github_health(http, "org", "repo")
+
+    assert result.errors == []
+    assert result.open_issues_count == 3
+    assert "Open issue count includes pull requests; GitHub issue search was unavailable" in result.warnings
+    # The exhausted search quota does not pause other api.github.com requests
+    assert throttle._resume_at == 0.0
+
+@pytest.mark.asyncio
+async def test_check_gitlab_health_without_total_header(mock_gitlab_response):
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/issues"):
+            return httpx.Response(200, json=[{"id": 1}])
+        if path.endswith("/repository/tree"):
+            return httpx.Response(200, json=[{"name": "README.md", "type": "blob"}])
+        return httpx.Response(200, json=dict(mock_gitlab_response, open_issues_count=12000))
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        result = await check_gitlab_health(http, "org", "repo")
+
+    assert result.errors == []
+    assert result.open_issues_count == 12000
+
+@pytest.mark.asyncio
+async def test_check_github_health_follows_repository_redirects(mock_github_response):
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.startswith("/repos/org/old-repo"):
+            new_path = path.replace("/repos/org/old-repo", "/repositories/1", 1)
+            return httpx.Response(301, headers={"Location": f"https://api.github.com{new_path}"})
+        if path.endswith("/search/issues"):
+            return httpx.Response(200, json={"total_count": 2})
+        if path.endswith("/readme") or path.endswith("/license"):
+            return httpx.Response(200)
+        return httpx.Response(200, json=mock_github_response)
+
+    async with create_http_client(httpx.MockTransport(handler)) as http:
+        result = await check_github_health(http, "org", "old-repo")
+
+    assert result.errors == []
+    assert result.has_readme is True
+    assert result.has_license is True
+
+@pytest.mark.asyncio
+async def test_retry_transport_does_not_retry_search_requests(monkeypatch):
+    monkeypatch.setattr("app.RETRY_BACKOFF", 0)
+    requested = []
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        return httpx.Response(429)
+
+    async with httpx.AsyncClient(transport=RetryTransport(httpx.MockTransport(handler))) as http:
+        response = await http.get("https://api.github.com/search/issues")
+
+    assert response.status_code == 429
+    assert requested == ["/search/issues"]
+
+@pytest.mark.asyncio
+async def test_health_checks_fall_back_when_issue_requests_fail(mock_github_response, mock_gitlab_response):
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/search/issues") or path.endswith("/issues"):
+            raise httpx.ConnectTimeout("timed out", request=request)
+        if path.endswith("/repository/tree"):
+            return httpx.Response(200, json=[{"name": "README.md", "type": "blob"}])
+        if path.endswith("/readme") or path.endswith("/license"):
+            return httpx.Response(200)
+        if request.url.host == "gitlab.com":
+            return httpx.Response(200, json=dict(mock_gitlab_response, open_issues_count=4))
+        return httpx.Response(200, json=dict(mock_github_response, open_issues_count=3))
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        github_result = await check_github_health(http, "org", "repo")
+        gitlab_result = await check_gitlab_health(http, "org", "repo")
+
+    assert github_result.errors == []
+    assert github_result.open_issues_count == 3
+    assert "Open issue count includes pull requests; GitHub issue search was unavailable" in github_result.warnings
+    assert gitlab_result.errors == []
+    assert gitlab_result.open_issues_count == 4
@@ -1,11 +1,42 @@
 import typer
 import json
+import sys
+import importlib
 from pathlib import Path
-from dep_extractor.extractor.requirements_txt import extract_requirements_txt
-from dep_extractor.extractor.environment_yml import extract_environment_yml
-from dep_extractor.extractor.pyproject_toml import extract_pyproject_toml
-from dep_extractor.extractor.package_json import extract_package_json
-from dep_extractor.extractor.poetry_lock import extract_poetry_lock
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder when orjson is unavailable
+    orjson = None
+
+# Manifest type inferred from each supported file name
+_NAME_TO_TYPE = {
+    'requirements.txt': 'requirements.txt',
+    'environment.yml': 'environment.yml',
+    'pyproject.toml': 'pyproject.toml',
+    'package.json': 'package.json',
+    'poetry.lock': 'poetry.lock',
+}
+
+# Extractor for each manifest type, imported on first use so only the needed parser loads
+_EXTRACTORS = {
+    'requirements.txt': 'dep_extractor.extractor.requirements_txt.extract_requirements_txt',
+    'environment.yml': 'dep_extractor.extractor.environment_yml.extract_environment_yml',
+    'pyproject.toml': 'dep_extractor.extractor.pyproject_toml.extract_pyproject_toml',
+    'package.json': 'dep_extractor.extractor.package_json.extract_package_json',
+    'poetry.lock': 'dep_extractor.extractor.poetry_lock.extract_poetry_lock',
+}
+
+def write_json(data) -> None:
+    """
+    Write data to stdout as indented JSON.
+    """
+    if orjson is None:
+        typer.echo(json.dumps(data, indent=2, ensure_ascii=False))
+        return
+    sys.stdout.flush()
+    sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    sys.stdout.buffer.flush()
 
 def main(
     file: Path = typer.Argument(..., help="Path to the manifest file"),
@@ -16,34 +47,17 @@ def main(
         raise typer.Exit(1)
     if not manifest_type:
         # Infer from file name
-        name = file.name.lower()
-        if name == 'requirements.txt':
-            manifest_type = 'requirements.txt'
-        elif name == 'environment.yml':
-            manifest_type = 'environment.yml'
-        elif name == 'pyproject.toml':
-            manifest_type = 'pyproject.toml'
-        elif name == 'package.json':
-            manifest_type = 'package.json'
-        elif name == 'poetry.lock':
-            manifest_type = 'poetry.lock'
-        else:
+        manifest_type = _NAME_TO_TYPE.get(file.name.lower())
+        if not manifest_type:
             typer.echo("Could not infer manifest type. Please specify --manifest-type.", err=True)
             raise typer.Exit(1)
-    if manifest_type == 'requirements.txt':
-        deps = extract_requirements_txt(str(file))
-    elif manifest_type == 'environment.yml':
-        deps = extract_environment_yml(str(file))
-    elif manifest_type == 'pyproject.toml':
-        deps = extract_pyproject_toml(str(file))
-    elif manifest_type == 'package.json':
-        deps = extract_package_json(str(file))
-    elif manifest_type == 'poetry.lock':
-        deps = extract_poetry_lock(str(file))
-    else:
+    extractor = _EXTRACTORS.get(manifest_type)
+    if not extractor:
         typer.echo(f"Unsupported manifest type: {manifest_type}", err=True)
         raise typer.Exit(1)
-    typer.echo(json.dumps([dep.__dict__ for dep in deps], indent=2))
+    module_name, func_name = extractor.rsplit('.', 1)
+    deps = getattr(importlib.import_module(module_name), func_name)(str(file))
+    write_json([dep.__dict__ for dep in deps])
 
 if __name__ == "__main__":
     typer.run(main)
\ No newline at end of file